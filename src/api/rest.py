@@ -1,28 +1,87 @@
-from fastapi import FastAPI, HTTPException, Query
+import io
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional
 from src.services.multi_database_fetcher import MultiDatabaseFetcher
+from src.query.builder import is_safe_identifier
+from src.services.filter_parser import parse_filters
+
+try:
+    import pyarrow as pa
+except ImportError:  # Arrow responses are optional, JSON always works
+    pa = None
 
 app = FastAPI(title='Oznak MVP API')
-fetcher = MultiLineFetcher()
+fetcher = MultiDatabaseFetcher()
+
+# Rows serialized per chunk of the streamed JSON response
+STREAM_CHUNK_ROWS = 10000
+ARROW_STREAM_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+ARROW_BATCH_ROWS = 8192
+
+
+def _stream_json(df, chunk_rows: int = STREAM_CHUNK_ROWS):
+    """
+    Yield {'rows': N, 'data': [...]} as JSON, encoding the records chunk by chunk
+    so the whole result never has to be materialized as Python dicts
+    """
+    yield f'{{"rows": {len(df)}, "data": ['
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows].to_json(orient='records', date_format='iso')
+        if start:
+            yield ','
+        yield chunk[1:-1]  # Strip the chunk's own [ ]
+    yield ']}'
+
+
+def _stream_arrow(df, batch_rows: int = ARROW_BATCH_ROWS):
+    """
+    Yield the DataFrame as an Arrow IPC stream, one record batch at a time
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=batch_rows):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()  # End-of-stream marker
+
 
 @app.get('/fetch')
 def fetch(databases: str = Query(..., description='Comma-separated databases'),
           time_from: Optional[str] = None,
           time_to: Optional[str] = None,
           last_n: Optional[int] = None,
-          reference: Optional[str] = None):
-    databases_list = [db.strip() for db in databases.split(',') if l.strip()]
-    if not databases_list_list:
+          reference: Optional[str] = None,
+          date_col: str = 'TimeStamp',
+          columns: Optional[str] = Query(None, description='Comma-separated columns to select, all when omitted'),
+          accept: Optional[str] = Header(None)):
+    databases_list = [db.strip() for db in databases.split(',') if db.strip()]
+    if not databases_list:
         raise HTTPException(status_code=400, detail='databases is required')
-    filters = {}
+    # Checked here since build_query errors are only logged per database, leaving the client an empty 200
+    if not is_safe_identifier(date_col):
+        raise HTTPException(status_code=400, detail=f'Invalid date column name: {date_col}')
+    if last_n is not None and last_n <= 0:
+        raise HTTPException(status_code=400, detail='last_n must be a positive integer')
+    filters = []
     if time_from:
-        filters['time_from'] = time_from
+        filters.append(f'{date_col} >= {time_from}')
     if time_to:
-        filters['time_to'] = time_to
-    if last_n:
-        filters['last_n'] = last_n
+        filters.append(f'{date_col} <= {time_to}')
     if reference:
-        filters['reference'] = reference
-    df = fetcher.fetch(databases_list, filters)
-    return {'rows': len(df), 'data': df.to_dict(orient='records')}
-
+        filters.append(f'RefName LIKE {reference}')
+    parsed = parse_filters(filters, last_n)
+    if not isinstance(parsed, dict):
+        raise HTTPException(status_code=400, detail='Invalid filter parameters')
+    # Narrow SELECT list so unused columns never leave the database server
+    columns_list = [col.strip() for col in columns.split(',') if col.strip()] if columns else None
+    for col in columns_list or ():
+        if not is_safe_identifier(col):
+            raise HTTPException(status_code=400, detail=f'Invalid column name: {col}')
+    df = fetcher.fetch(databases_list, parsed['filters'], parsed['limit'], date_col, columns_list)
+    if pa is not None and accept and ARROW_STREAM_MEDIA_TYPE in accept:
+        return StreamingResponse(_stream_arrow(df), media_type=ARROW_STREAM_MEDIA_TYPE)
+    return StreamingResponse(_stream_json(df), media_type='application/json')
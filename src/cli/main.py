@@ -1,7 +1,9 @@
+import logging
 import typer
 from src.services.multi_database_fetcher import MultiDatabaseFetcher
 from src.services.filter_parser import parse_filters
 from src.storage.exporter import export
+from src.utils.logging_setup import setup_logging
 
 app = typer.Typer()
 
@@ -13,7 +15,14 @@ def load(
         last: int = typer.Option(None, "--last", help="Limit to last N records"),
         date_col: str = typer.Option("TimeStamp", "--date_col", help="Name of the date/timestamp column for ordering (when using --last)"),
         out: str = typer.Option("output.csv", "--out", "-o", help="Output file (CSV or Excel)"),
+        arrow_csv: bool = typer.Option(False, "--arrow-csv", help="Write CSV with pyarrow (faster, quotes all strings and keeps full timestamp precision)"),
+        verbose: bool = typer.Option(False, "--verbose", "-v", help="Show per-database and per-query progress"),
 ):
+    setup_logging(logging.INFO)
+    if verbose:
+        # Per-database/per-query progress is logged at debug level by the src.* modules
+        logging.getLogger("src").setLevel(logging.DEBUG)
+
     # Validate inputs
     if last is not None and (not isinstance(last, int) or last <= 0):
         print("'last' must be a positive integer")
@@ -44,7 +53,7 @@ def load(
         print("No data to export")
         return
 
-    export(df, out)
+    export(df, out, arrow_csv=arrow_csv)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
+import logging
 import pyodbc
 
+logger = logging.getLogger(__name__)
+
 
 def connect_mssql(cfg, user, password):
     try:
@@ -11,9 +14,9 @@ def connect_mssql(cfg, user, password):
             f"PWD={password};"
         )
         connection = pyodbc.connect(conn_str)
-        print(f"Connected to MSSQL database: {cfg['database']}")
+        logger.info("Connected to MSSQL database: %s", cfg["database"])
         return connection
     except Exception as e:
-        print(f"Error connecting to MSSQL: {e}")
+        logger.error("Error connecting to MSSQL: %s", e)
         return None
 
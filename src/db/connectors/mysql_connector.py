@@ -1,6 +1,9 @@
+import logging
 import mysql.connector
 from mysql.connector import Error
 
+logger = logging.getLogger(__name__)
+
 
 def connect_mysql(cfg, user, password):
     try:
@@ -12,9 +15,9 @@ def connect_mysql(cfg, user, password):
             database=cfg["database"]
         )
         if connection.is_connected():
-            print(f"Connected to MySQL database: {cfg['database']}")
+            logger.info("Connected to MySQL database: %s", cfg["database"])
             return connection
     except Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        logger.error("Error connecting to MySQL: %s", e)
         return None
 
@@ -1,13 +1,39 @@
+import os
+from functools import lru_cache
+from types import MappingProxyType
 import yaml
 from sqlalchemy import create_engine
 from src.utils.env import get_credentials
 from config.settings import CONFIG_PATH
 
+# libyaml-backed loader when available, pure-Python fallback otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Engines shared by every DBManager, keyed by connection string so config edits get a new engine
+_ENGINES = {}
+
+# Connection pool per engine: connections kept open between fetches, extra ones allowed under load
+POOL_SIZE = 8
+MAX_OVERFLOW = 16
+POOL_RECYCLE = 3600  # Seconds, recycle before server-side idle timeouts (MySQL wait_timeout) drop the connection
+
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: str, mtime: float):
+    """
+    Parse the databases section once per (path, mtime) so edits to the file are still picked up
+    The result is shared by every DBManager, so it is returned as read-only views
+    """
+    with open(config_path, "r", encoding="utf-8") as f:
+        databases = yaml.load(f, Loader=_YAML_LOADER)["databases"]
+    return MappingProxyType({name: MappingProxyType(entry) for name, entry in databases.items()})
+
 
 class DBManager:
     def __init__(self, config_path=CONFIG_PATH):
-        with open(config_path, "r", encoding="utf-8") as f:
-            self.cfg = yaml.safe_load(f)["databases"]
+        config_path = str(config_path)
+        self.cfg = _load_config(config_path, os.path.getmtime(config_path))
+        # This instance's cfg never changes, so its engines can be looked up by database name
         self.engines = {}
 
     def get_engine(self, database: str):
@@ -23,19 +49,23 @@ class DBManager:
         # Build connection string based on database type
         if entry["type"] == "mysql":
             # Using PyMySQL driver for compatibility with SQLAlchemy
-            conn_str = f"mysql+pymysql://{user}:{password}@{entry["host"]}:{entry["port"]}/{entry["database"]}"
+            conn_str = f"mysql+pymysql://{user}:{password}@{entry['host']}:{entry['port']}/{entry['database']}"
         elif entry["type"] == "mssql":
             # Using pyodbc driver
             conn_str = f"mssql+pyodbc://{user}:{password}@{entry['host']}:{entry['port']}/{entry['database']}?driver=ODBC+Driver+17+for+SQL+Server"
         else:
-            raise ValueError(f"Unsupported DB type: {entry["type"]}")
-
-        engine = create_engine(
-            conn_str,
-            echo=False, # For debugging
-            pool_pre_ping=True, # Verify connection before use
-            # Add other options as needed: pool_size, max_overflow, etc
-        )
+            raise ValueError(f"Unsupported DB type: {entry['type']}")
+
+        engine = _ENGINES.get(conn_str)
+        if engine is None:
+            engine = _ENGINES.setdefault(conn_str, create_engine(
+                conn_str,
+                echo=False, # For debugging
+                pool_pre_ping=True, # Verify connection before use
+                pool_size=POOL_SIZE,
+                max_overflow=MAX_OVERFLOW,
+                pool_recycle=POOL_RECYCLE,
+            ))
 
         self.engines[database] = engine
         return engine
@@ -1,53 +1,119 @@
+import logging
 import re
+from functools import lru_cache
 
-def parse_filter_string(filter_str: str):
+logger = logging.getLogger(__name__)
+
+# Only allow safe operators
+_ALLOWED_OPS = frozenset({
+    '=', '!=', '<>', '<=', '>=', '<', '>', # > and < to be removed? due to some weird bug on windows shell
+    'LIKE', 'NOT LIKE', 'IN', 'NOT IN',
+    'IS', 'IS NOT'
+})
+
+# "column operator value" in one pass: identifier column (SQL injection protection), whitelisted
+# operator (longer alternatives first) and the rest as value. re.ASCII keeps IGNORECASE from
+# letting non-ASCII letters (e.g. the Kelvin sign) into the column name, re.DOTALL lets values span lines
+_FILTER_RE = re.compile(
+    r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s+(=|!=|<>|<=|>=|<|>|LIKE|NOT\s+LIKE|IN|NOT\s+IN|IS\s+NOT|IS)\s+(.+?)\s*\Z",
+    re.IGNORECASE | re.ASCII | re.DOTALL,
+)
+
+# Comma-separated IN list items, already stripped of surrounding whitespace (empty items are dropped)
+_CSV_RE = re.compile(r"[^,\s][^,]*[^,\s]|[^,\s]")
+
+# LIKE wildcards and the default escape character, a pattern without any of them is an equality check
+_LIKE_SPECIAL_CHARS = frozenset("%_\\")
+
+def is_safe_identifier(name: str):
     """
-    Parse filter string like "RefName LIKE V123456" into (column, operator, value)
+    Plain SQL identifier check (SQL injection protection): [a-zA-Z_][a-zA-Z0-9_]*
+    ASCII-only isidentifier() accepts exactly that set, without entering the regex engine
+    Also used by callers (e.g. the API) to reject names before any query is built
+    """
+    return name.isascii() and name.isidentifier()
+
+def _raise_filter_error(filter_str: str):
+    """
+    Explain why filter_str didn't match _FILTER_RE (slow path, only runs for invalid filters)
     """
-    # Split by spaces but handle quoted values
     parts = filter_str.split()
     if len(parts) < 3:
         raise ValueError(f"Invalid filter format: {filter_str}. Expected: 'column operator value'")
-    
-    column = parts[0]
-    operator = parts[1].upper()
-    value = " ".join(parts[2:])  # Join remaining parts as value
-    
+
     # Validate column name (SQL injection protection)
-    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", column):
-        raise ValueError(f"Invalid column name: {column}")
-    
-    # Validate operator (only allow safe operators)
-    allowed_operators = {
-        '=', '!=', '<>', '<=', '>=', '<', '>', # > and < to be removed? due to some weird bug on windows shell
-        'LIKE', 'NOT LIKE', 'IN', 'NOT IN',
-        'IS', 'IS NOT'
-    }
-    if operator not in allowed_operators:
-        raise ValueError(f"Invalid operator: {operator}. Allowed: {', '.join(allowed_operators)}")
-    
-    return column, operator, value
+    if not is_safe_identifier(parts[0]):
+        raise ValueError(f"Invalid column name: {parts[0]}")
+
+    if parts[1].upper() not in _ALLOWED_OPS:
+        raise ValueError(f"Invalid operator: {parts[1].upper()}. Allowed: {', '.join(_ALLOWED_OPS)}")
+
+    raise ValueError(f"Invalid filter format: {filter_str}. Expected: 'column operator value'")
 
-def build_query(table: str, filters: list, limit: int = None, date_column: str = "TimeStamp", columns: list = None):
+def parse_filter_string(filter_str: str):
+    """
+    Parse filter string like "RefName LIKE V123456" into (column, operator, value)
+    Column, operator and value are extracted and validated by a single _FILTER_RE match
+    """
+    match = _FILTER_RE.match(filter_str)
+    if not match:
+        _raise_filter_error(filter_str)
+
+    column, operator, value = match.groups()
+    # Canonical upper-case operator and value with single spaces ("not  like" -> "NOT LIKE", "line1\nline2" -> "line1 line2")
+    return column, " ".join(operator.upper().split()), " ".join(value.split())
+
+def build_query(table: str, filters: list, limit: int = None, date_column: str = "TimeStamp", columns: list = None,
+                database: str = None, param_prefix: str = "param", keyset=None):
     """
     Build a SQL query with generic filters
     filters: list of filter strings like ["RefName LIKE V123456", "Date >= 2025-01-01"]
+             or (column, operator, value) tuples already parsed by parse_filters
     date_column: name of the date/timestamp column for default ordering (when using LIMIT)
     columns: list of columns for SELECT statement
+    database: optional database name to qualify the table with (`database`.`table`)
+    param_prefix: prefix of the generated bind parameter names, so several queries can share one statement
+    keyset: date_column value of the last row already fetched, for "load more" paging with limit
+            (adds date_column < keyset, so the server seeks the date index instead of sorting the whole table)
+    Results are cached per distinct arguments (the same filters are built for every database of a fetch),
+    each call gets its own params dict
+    """
+    filters = tuple(f if isinstance(f, str) else tuple(f) for f in filters)
+    columns = tuple(columns) if columns is not None else None
+    query, params, rewrites = _build_query(table, filters, limit, date_column, columns, database, param_prefix, keyset)
+    # Logged here rather than in _build_query, which only runs on a cache miss
+    for column, operator, value, equality_op in rewrites:
+        logger.debug("Rewriting %s %s %r as %s", column, operator, value, equality_op)
+    # Copy out of the cache, IN lists included, so callers can't modify the cached result
+    return query, {name: list(value) if isinstance(value, list) else value for name, value in params.items()}
+
+@lru_cache(maxsize=256, typed=True)
+def _build_query(table: str, filters: tuple, limit, date_column: str, columns, database, param_prefix: str, keyset):
+    """
+    build_query implementation, arguments already converted to hashable tuples
+    Returns (query, params, rewrites), rewrites being the (column, operator, value, equality_op) of each LIKE turned into =/!=
     """
     # Validate table name (SQL injection protection)
-    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", table):
+    if not is_safe_identifier(table):
         raise ValueError(f"Invalid table name: {table}")
 
+    # Validate database name (SQL injection protection)
+    if database is not None and not is_safe_identifier(database):
+        raise ValueError(f"Invalid database name: {database}")
+
+    # Validate parameter prefix, it ends up in the SQL text
+    if not is_safe_identifier(param_prefix):
+        raise ValueError(f"Invalid parameter prefix: {param_prefix}")
+
     # Validate date_column name (SQL injection protection)
-    if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", date_column):
+    if not is_safe_identifier(date_column):
         raise ValueError(f"Invalid date column name: {date_column}")
     
     # Validate columns list if provided (SQL injection protection)
     if columns is not None:
         validated_columns = []
         for col in columns:
-            if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", col):
+            if not is_safe_identifier(col):
                 raise ValueError(f"Invalid column name: {col}")
             safe_col = f"`{col}`"
             validated_columns.append(safe_col)
@@ -55,44 +121,64 @@ def build_query(table: str, filters: list, limit: int = None, date_column: str =
     else:
         select_clause = f"SELECT *"
 
-    safe_table = f"`{table}`"
+    safe_table = f"`{table}`" if database is None else f"`{database}`.`{table}`"
     safe_date_col = f"`{date_column}`"
 
     where_conditions = []
     params = {}
+    rewrites = []
     param_counter = 0
     
-    for filter_str in filters:
-        column, operator, value = parse_filter_string(filter_str)
+    for filter_item in filters:
+        if isinstance(filter_item, str):
+            column, operator, value = parse_filter_string(filter_item)
+        else:
+            column, operator, value = filter_item
+            # Pre-parsed tuples still end up in the SQL text (SQL injection protection)
+            if not is_safe_identifier(column):
+                raise ValueError(f"Invalid column name: {column}")
+            if operator not in _ALLOWED_OPS:
+                raise ValueError(f"Invalid operator: {operator}. Allowed: {', '.join(_ALLOWED_OPS)}")
         safe_column = f"`{column}`"
         
         # Handle different operators
         if operator in ['LIKE', 'NOT LIKE']:
-            param_name = f"param_{param_counter}"
-            where_conditions.append(f"{safe_column} {operator} :{param_name}")
+            param_name = f"{param_prefix}_{param_counter}"
+            if not _LIKE_SPECIAL_CHARS.intersection(value) and value == value.rstrip():
+                # No wildcards, plain equality can use an index lookup instead of a pattern match
+                # Not exactly LIKE: with PAD SPACE collations (MySQL, MSSQL) = ignores trailing spaces and LIKE doesn't,
+                # so values with trailing whitespace keep LIKE, and stored values with trailing spaces now match.
+                # On numeric columns = compares as numbers ('0123' matches 123), LIKE as strings
+                equality_op = "=" if operator == "LIKE" else "!="
+                rewrites.append((column, operator, value, equality_op))
+                where_conditions.append(f"{safe_column} {equality_op} :{param_name}")
+            else:
+                where_conditions.append(f"{safe_column} {operator} :{param_name}")
             params[param_name] = value
             param_counter += 1
         elif operator in ['IN', 'NOT IN']:
             # For IN clauses, value should be comma-separated like "A,B,C"
-            values = [v.strip() for v in value.split(',')]
-            placeholders = []
-            for v in values:
-                param_name = f"param_{param_counter}"
-                placeholders.append(f":{param_name}")
-                params[param_name] = v
-                param_counter += 1
-            where_clause_part = f"{safe_column} {operator} ({','.join(placeholders)})"
-            where_conditions.append(where_clause_part)
+            # One list-valued param, expanded to (:p_1, :p_2, ...) by SQLAlchemy at execution (see fetcher._text)
+            param_name = f"{param_prefix}_{param_counter}"
+            where_conditions.append(f"{safe_column} {operator} :{param_name}")
+            params[param_name] = _CSV_RE.findall(value)
+            param_counter += 1
         elif operator in ['IS', 'IS NOT']:
             # For IS/IS NOT, value should be NULL, NOT NULL, etc.
             where_conditions.append(f"{safe_column} {operator} {value}")
         else:
             # For =, !=, <>, <, >, <=, >=
-            param_name = f"param_{param_counter}"
+            param_name = f"{param_prefix}_{param_counter}"
             where_conditions.append(f"{safe_column} {operator} :{param_name}")
             params[param_name] = value
             param_counter += 1
 
+    # Keyset pagination: continue below the oldest row of the previous page
+    if keyset is not None:
+        param_name = f"{param_prefix}_keyset"
+        where_conditions.append(f"{safe_date_col} < :{param_name}")
+        params[param_name] = keyset
+
     if not where_conditions:
         base_query = f"{select_clause} FROM {safe_table}"
     else:
@@ -105,5 +191,5 @@ def build_query(table: str, filters: list, limit: int = None, date_column: str =
             raise ValueError("LIMIT must be a positive integer")
         base_query = f"{base_query} ORDER BY {safe_date_col} DESC LIMIT {limit}"
 
-    return base_query, params
+    return base_query, params, tuple(rewrites)
 
@@ -1,23 +1,113 @@
+import logging
+from functools import lru_cache
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
+try:
+    import connectorx as cx
+except ImportError:  # Optional fast path, pandas.read_sql is used otherwise
+    cx = None
 
-def fetch_data(engine, query: str, params: dict = None):
+try:
+    import pyarrow  # noqa: F401
+    # Arrow-backed columns: strings land in one contiguous buffer instead of an object array of str
+    DTYPE_BACKEND = "pyarrow"
+except ImportError:
+    DTYPE_BACKEND = None
+
+logger = logging.getLogger(__name__)
+
+# Rows per chunk pulled from the server-side cursor
+DEFAULT_CHUNKSIZE = 50000
+
+# SQLAlchemy dialects that connectorx can read from directly
+CONNECTORX_DIALECTS = {"mysql", "mssql", "postgresql", "sqlite"}
+
+
+@lru_cache(maxsize=1000)
+def _text(query: str, expanding: tuple = ()):
+    """
+    TextClause per distinct SQL string, so :param_name placeholders are parsed once per query template
+    TextClause is immutable (bindparams() returns a copy), so sharing it between threads is safe
+    expanding: names of list-valued params (IN filters), rendered as one placeholder per item at execution
+    """
+    clause = text(query)
+    if expanding:
+        clause = clause.bindparams(*[bindparam(name, expanding=True) for name in expanding])
+    return clause
+
+
+def _expanding_params(params: dict):
+    """ Names of the list-valued params, in a hashable form for the _text cache """
+    return tuple(name for name, value in params.items() if isinstance(value, list)) if params else ()
+
+
+@lru_cache(maxsize=None)
+def _literal_dialect(dialect_cls):
+    """
+    Dialect used to render the connectorx SQL, with a paramstyle that leaves % alone
+    The engine's own dialect may use format/pyformat (pymysql), which doubles every % in the rendered literals
+    """
+    return dialect_cls(paramstyle="named")
+
+
+def _read_sql_connectorx(engine, query: str, params: dict = None):
+    """
+    Read the query with connectorx, which decodes rows straight into columnar buffers
+    Params are bound as literals by SQLAlchemy (escaped for the engine's dialect) since connectorx takes plain SQL
+    """
+    # bindparam() with the value infers each literal's type, which lists bound by name alone would lack
+    clause = _text(query)
+    if params:
+        clause = clause.bindparams(*[bindparam(name, value, expanding=isinstance(value, list)) for name, value in params.items()])
+    sql = str(clause.compile(dialect=_literal_dialect(type(engine.dialect)), compile_kwargs={"literal_binds": True}))
+    # connectorx wants the bare backend scheme (mysql://, mssql://), not the SQLAlchemy driver suffix
+    uri = engine.url.set(drivername=engine.url.get_backend_name()).render_as_string(hide_password=False)
+    return cx.read_sql(uri, sql, return_type="pandas")
+
+
+def iter_data(engine, query: str, params: dict = None, chunksize: int = DEFAULT_CHUNKSIZE):
+    """
+    Stream query results as DataFrame chunks of at most chunksize rows
+    Opens the connection with stream_results=True so the driver uses a server-side cursor
+    (e.g. SSCursor for MySQL) instead of buffering the whole result set in memory
+    Columns are pyarrow-backed when pyarrow is installed
+    """
+    read_kwargs = {"chunksize": chunksize}
+    if params:
+        read_kwargs["params"] = params
+    if DTYPE_BACKEND:
+        read_kwargs["dtype_backend"] = DTYPE_BACKEND
+
+    with engine.connect().execution_options(stream_results=True, max_row_buffer=chunksize) as conn:
+        yield from pd.read_sql(_text(query, _expanding_params(params)), conn, **read_kwargs)
+
+
+def fetch_data(engine, query: str, params: dict = None, chunksize: int = DEFAULT_CHUNKSIZE, raise_errors: bool = False):
     """
     Fetch data using SQLAlchemy engine and return a pandas DataFrame
     Expects query string with :param_name placeholders and a params dictionary
-    Uses sqlalchemy.text() for the query and params= keyword for pandas
+    Uses sqlalchemy.text() (cached per query string) for the query and params= keyword for pandas
+    Results are streamed in chunks (see iter_data) and concatenated once at the end
+    When connectorx is installed and supports the dialect, it is used instead, falling back to pandas on error
+    Errors are logged and an empty DataFrame returned, unless raise_errors is set
     """
     try:
-        print(f"Executing query on database...")
-        # Use pandas with the SQLAlchemy engine
-        if params:
-            df = pd.read_sql(text(query), engine, params=params)
-        else:
-            df = pd.read_sql(text(query), engine)
-        print(f"Fetched {len(df)} records from database")
+        logger.debug("Executing query on database...")
+        if cx is not None and engine.dialect.name in CONNECTORX_DIALECTS:
+            try:
+                df = _read_sql_connectorx(engine, query, params)
+                logger.debug("Fetched %d records from query: %.50s...", len(df), query)
+                return df
+            except Exception as e:
+                logger.warning("connectorx read failed, falling back to pandas: %s", e)
+        chunks = list(iter_data(engine, query, params, chunksize))
+        # Arrow-backed chunks are joined as one pa.ChunkedArray per column, without copying their buffers
+        df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+        logger.debug("Fetched %d records from query: %.50s...", len(df), query)
         return df
     except Exception as e:
-        print(f"Error executing query: {e}")
+        if raise_errors:
+            raise
+        logger.error("Error executing query: %s", e)
         return pd.DataFrame()
-
@@ -1,9 +1,35 @@
+import logging
+import threading
 from src.db.manager import DBManager
 from src.query.builder import build_query
 from src.query.fetcher import fetch_data
+from src.utils.env import get_credentials
+import numpy as np
 import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent database fetches
+MAX_FETCH_WORKERS = 32
+
+# Worker threads shared by every fetch, created on first use and reused afterwards
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+# Database types whose queries can be combined into one UNION ALL statement (build_query emits MySQL syntax)
+UNION_DB_TYPES = {"mysql"}
+
+
+def _get_executor():
+    """ Shared ThreadPoolExecutor, so each fetch reuses idle workers instead of starting new threads """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=MAX_FETCH_WORKERS, thread_name_prefix="oznak-fetch")
+    return _EXECUTOR
+
 
 def _fetch_single_database(database, filters, limit, date_column, columns, db_manager_instance):
     """
@@ -11,25 +37,26 @@ def _fetch_single_database(database, filters, limit, date_column, columns, db_ma
     Returns the DataFrame with 'source_database' column or None if it fails
     """
     try:
-        print(f"    Thread fetching database: {database}")
+        logger.debug("Thread fetching database: %s", database)
         engine = db_manager_instance.get_engine(database)
 
         cfg = db_manager_instance.cfg[database]
         table = cfg["table"]
 
         query, params = build_query(table, filters, limit, date_column, columns)
-        print(f"   └── Query: {query[:50]}...") # Could be too much spam on the terminal :(
-        
+        logger.debug("Query for %s: %.50s...", database, query)
+
         df = fetch_data(engine, query, params)
         if not df.empty:
-            df["source_database"] = database
-            print(f"    Thread fetched {len(df)} records from {database}")
+            # Categorical tag: one string per database instead of one reference per row
+            df["source_database"] = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[database])
+            logger.debug("Thread fetched %d records from %s", len(df), database)
             return df
         else:
-            print(f"    Thread fetched no data from {database}")
+            logger.debug("Thread fetched no data from %s", database)
             return None
     except Exception as e:
-        print(f"    Thread failed to fetch from {database}: {e}")
+        logger.error("Failed to fetch from %s: %s", database, e)
         return None
 
 
@@ -37,16 +64,90 @@ class MultiDatabaseFetcher:
     def __init__(self):
         self.db = DBManager()
 
+    def _group_by_server(self, databases: list, columns: list = None):
+        """
+        Split databases into groups living on the same server with the same credentials,
+        which can be queried with a single UNION ALL statement, and the rest, fetched one by one
+        Only grouped for an explicit columns list: UNION ALL matches columns by position,
+        so SELECT * over tables with the same columns in a different order would mix them up silently
+        Returns (union_groups, single_databases)
+        """
+        if not columns:
+            return [], list(databases)
+
+        servers = {}
+        single_databases = []
+        for database in databases:
+            entry = self.db.cfg.get(database, {})
+            if entry.get("type") in UNION_DB_TYPES and entry.get("host") and entry.get("database"):
+                key = (entry["type"], entry["host"], entry.get("port"), get_credentials(database))
+                servers.setdefault(key, []).append(database)
+            else:
+                single_databases.append(database)
+
+        union_groups = []
+        for group in servers.values():
+            if len(group) > 1:
+                union_groups.append(group)
+            else:
+                single_databases.extend(group)
+        return union_groups, single_databases
+
+    def _build_union_query(self, databases: list, filters: list, limit: int = None, date_column: str = "TimeStamp", columns: list = None):
+        """
+        Build one UNION ALL statement over databases on the same server
+        Each part keeps its own ORDER BY/LIMIT (same rows as fetching the databases one by one)
+        and tags its rows with a source_database column
+        """
+        parts = []
+        params = {}
+        for i, database in enumerate(databases):
+            entry = self.db.cfg[database]
+            query, query_params = build_query(entry["table"], filters, limit, date_column, columns,
+                                              database=entry["database"], param_prefix=f"db{i}_param")
+            source_param = f"db{i}_source"
+            parts.append(f"SELECT t{i}.*, :{source_param} AS source_database FROM ({query}) AS t{i}")
+            params.update(query_params)
+            params[source_param] = database
+        return " UNION ALL ".join(parts), params
+
+    def _fetch_union(self, databases: list, filters: list, limit: int, date_column: str, columns: list):
+        """
+        Fetch a same-server group with one round trip, falling back to one query per database if the
+        UNION ALL fails (e.g. a selected column missing from one of the tables)
+        Returns the DataFrame with 'source_database' column or None if there is no data
+        """
+        try:
+            logger.debug("Fetching %s with one UNION ALL query", ", ".join(databases))
+            engine = self.db.get_engine(databases[0])
+            query, params = self._build_union_query(databases, filters, limit, date_column, columns)
+            df = fetch_data(engine, query, params, raise_errors=True)
+            return df if not df.empty else None
+        except Exception as e:
+            logger.warning("UNION ALL fetch failed for %s, fetching one by one: %s", ", ".join(databases), e)
+
+        frames = [_fetch_single_database(db, filters, limit, date_column, columns, self.db) for db in databases]
+        frames = [df for df in frames if df is not None]
+        return pd.concat(frames, ignore_index=True) if frames else None
+
     def fetch(self, databases: list, filters: list, limit: int = None, date_column: str = "TimeStamp", columns: list = None):
+        """
+        Fetch from all databases concurrently and combine the results
+        """
         frames = []
+        union_groups, single_databases = self._group_by_server(databases, columns)
 
-        # Use ThreadPoolExecutor to fetch from multiple databases concurrently
-        # max_workers could be configurable, or default to number of CPUs
-        with ThreadPoolExecutor() as executor:
-            future_to_database = {
-                executor.submit(_fetch_single_database, db, filters, limit, date_column, columns, self.db): db for db in databases
-            }
+        # Fetch from multiple databases concurrently on the shared executor
+        # One task per database/server group (I/O bound), the pool caps the number of threads (MAX_FETCH_WORKERS)
+        executor = _get_executor()
+        future_to_database = {
+            executor.submit(self._fetch_union, group, filters, limit, date_column, columns): ", ".join(group) for group in union_groups
+        }
+        future_to_database.update({
+            executor.submit(_fetch_single_database, db, filters, limit, date_column, columns, self.db): db for db in single_databases
+        })
 
+        # Handle results as they complete, while the remaining databases are still being queried
         for future in as_completed(future_to_database):
             database = future_to_database[future]
             try:
@@ -54,15 +155,19 @@ class MultiDatabaseFetcher:
                 if df is not None and not df.empty:
                     frames.append(df)
             except Exception as e:
-                print(f"Unexpected error processing result for {database}: {e}")
+                logger.error("Unexpected error processing result for %s: %s", database, e)
 
         if not frames:
-            print(f"No data fetched from any database")
+            logger.warning("No data fetched from any database")
             return pd.DataFrame()
 
-        print(f"Combining data from {len(frames)} databases...")
-        combined_df = pd.concat(frames, ignore_index=True)
-        print(f"Combined {len(combined_df)} records from {len(frames)} databases")
+        logger.debug("Combining %d result sets...", len(frames))
+        # One dtype for every frame's tag (categories = requested databases, in request order), so concat
+        # joins the codes directly instead of falling back to one Python string per row
+        source_dtype = pd.CategoricalDtype(categories=list(dict.fromkeys(databases)))
+        combined_df = pd.concat([df.assign(source_database=pd.Categorical(df["source_database"], dtype=source_dtype)) for df in frames],
+                                ignore_index=True)
+        logger.info("Combined %d records from %d databases", len(combined_df), combined_df["source_database"].nunique())
 
         return combined_df
 
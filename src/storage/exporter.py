@@ -1,16 +1,67 @@
+import logging
+import os
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:  # Optional, pandas' CSV writer is used otherwise
+    pa = None
 
-def export(df, path: str):
+try:
+    import xlsxwriter  # noqa: F401
+except ImportError:  # Optional, pandas' default Excel engine (openpyxl) is used otherwise
+    xlsxwriter = None
+
+logger = logging.getLogger(__name__)
+
+
+def _write_csv(df, path: str):
+    df.to_csv(path, index=False)
+
+
+def _write_csv_arrow(df, path: str):
+    """
+    Arrow's C++ writer encodes whole columns instead of formatting row by row in Python
+    Its output differs from pandas': every string is quoted and datetimes keep their full precision
+    (2025-01-01 00:00:00.000000 instead of 2025-01-01), so it is only used when asked for
+    """
+    if pa is not None:
+        try:
+            pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+            return
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            logger.debug("pyarrow CSV writer failed, using pandas: %s", e)
+    _write_csv(df, path)
+
+
+def _write_excel(df, path: str):
+    if xlsxwriter is not None and path.lower().endswith(".xlsx"):
+        # No constant_memory: to_excel writes column by column and that mode drops cells of already flushed rows
+        df.to_excel(path, index=False, engine="xlsxwriter")
+        return
+    df.to_excel(path, index=False)
+
+
+# Output extension -> writer, single lookup instead of chained endswith checks
+_WRITERS = {
+    ".csv": _write_csv,
+    ".xlsx": _write_excel,
+    ".xls": _write_excel,
+}
+
+
+def export(df, path: str, arrow_csv: bool = False):
+    """
+    Write df to a .csv or .xlsx/.xls file
+    arrow_csv: write CSV with pyarrow's faster writer (see _write_csv_arrow for how its output differs)
+    """
     try:
-        if path.endswith(".csv"):
-            df.to_csv(path, index=False)
-            print(f"Data exported to {path}")
-        elif path.endswith((".xlsx", ".xls")):
-            df.to_excel(path, index=False)
-            print(f"Data exported to {path}")
-        else:
+        extension = os.path.splitext(path)[1].lower()
+        writer = _write_csv_arrow if arrow_csv and extension == ".csv" else _WRITERS.get(extension)
+        if writer is None:
             raise ValueError("Unsupported format. Use .csv or .xlsx/.xls")
+        writer(df, path)
+        logger.info("Data exported to %s", path)
     except Exception as e:
-        print(f"Error exporting: {e}")
-
+        logger.error("Error exporting: %s", e)
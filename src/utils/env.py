@@ -1,11 +1,17 @@
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
 
 load_dotenv()
 
 
+@lru_cache(maxsize=64)
 def get_credentials(database_name: str):
-    user = os.getenv(f"{database_name.upper()}_USER")
-    password = os.getenv(f"{database_name.upper()}_PASSWORD")
+    """
+    Return (user, password) from <DATABASE>_USER / <DATABASE>_PASSWORD env variables
+    Cached per database name - call get_credentials.cache_clear() after changing them at runtime
+    """
+    prefix = database_name.upper()
+    user = os.getenv(f"{prefix}_USER")
+    password = os.getenv(f"{prefix}_PASSWORD")
     return user, password
-
@@ -0,0 +1,31 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
+# Background thread writing queued records, started by the first setup_logging() call
+_listener = None
+
+
+def setup_logging(level: int = logging.INFO, fmt: str = "%(message)s"):
+    """
+    Attach a QueueHandler to the root logger, with a QueueListener writing the records to stderr
+    Fetch worker threads only enqueue records, the stream write happens on the listener thread
+    Calling it again only updates the root level
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if _listener is not None:
+        return _listener
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(fmt))
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    # Flush whatever is still queued before the interpreter exits
+    atexit.register(_listener.stop)
+    return _listener
@@ -0,0 +1,30 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(scope="session")
+def df_db1():
+    """ Two-row frame standing in for database1's result, shared by the whole run - copy() before modifying it """
+    return pd.DataFrame({"col1": [1, 2], "col2": ['a', 'b']})
+
+
+@pytest.fixture(scope="session")
+def df_db2():
+    """ Two-row frame standing in for database2's result, shared by the whole run - copy() before modifying it """
+    return pd.DataFrame({"col1": [3, 4], "col2": ['c', 'd']})
+
+
+@pytest.fixture(scope="session")
+def df_empty():
+    """ Result of a query matching no rows, shared by the whole run - copy() before modifying it """
+    return pd.DataFrame()
+
+
+@pytest.fixture(scope="session")
+def cli_app():
+    """ The Typer app from src.cli.main, imported once per run """
+    try:
+        from src.cli.main import app
+    except Exception as e:
+        pytest.fail(f"Failed to load or validate CLI app: {e}")
+    return app
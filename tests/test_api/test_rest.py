@@ -0,0 +1,134 @@
+import json
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+from src.api import rest
+from src.api.rest import _stream_arrow, _stream_json, app
+
+# One column per type that needs care when serialized: nulls, timestamps and categorical tags
+_DF = pd.DataFrame({
+    "value": [1.5, None, 3.5, 4.5, None],
+    "TimeStamp": pd.to_datetime(["2025-01-01 08:00:00", "2025-01-02 00:00:00", None, "2025-01-04 00:00:00", "2025-01-05 23:59:59"]),
+    "source_database": pd.Categorical(["db1", "db1", "db2", "db2", "db2"]),
+})
+
+
+""" Tests for _stream_json """
+
+@pytest.mark.parametrize("df, chunk_rows", [
+    pytest.param(pd.DataFrame(), 2, id="empty_frame"),
+    pytest.param(_DF.iloc[0:0], 2, id="empty_frame_with_columns"),
+    pytest.param(_DF, 10, id="single_chunk"),
+    pytest.param(_DF, 2, id="several_chunks"),
+    pytest.param(_DF, 1, id="one_row_per_chunk"),
+])
+def test_stream_json(df, chunk_rows):
+    """
+    Test that the streamed body is valid JSON with the same records as one to_json call
+    """
+    # Act
+    body = "".join(_stream_json(df, chunk_rows))
+
+    # Assert
+    assert json.loads(body) == {"rows": len(df), "data": json.loads(df.to_json(orient="records", date_format="iso"))}
+
+def test_stream_json_types():
+    """
+    Test how nulls, timestamps and categorical tags are encoded
+    """
+    # Act
+    data = json.loads("".join(_stream_json(_DF, 2)))["data"]
+
+    # Assert
+    assert data[1]["value"] is None
+    assert data[0]["TimeStamp"].startswith("2025-01-01T08:00:00")
+    assert data[2]["TimeStamp"] is None
+    assert [row["source_database"] for row in data] == ["db1", "db1", "db2", "db2", "db2"]
+
+
+""" Tests for _stream_arrow """
+
+@pytest.mark.parametrize("df, batch_rows", [
+    pytest.param(_DF, 10, id="single_batch"),
+    pytest.param(_DF, 2, id="several_batches"),
+])
+def test_stream_arrow_round_trip(df, batch_rows):
+    """
+    Test that the IPC stream reads back as the same frame, nulls, timestamps and categoricals included
+    """
+    # Arrange
+    pa = pytest.importorskip("pyarrow")
+
+    # Act
+    reader = pa.ipc.open_stream(b"".join(_stream_arrow(df, batch_rows)))
+    batches = list(reader)
+    result_df = pa.Table.from_batches(batches, schema=reader.schema).to_pandas()
+
+    # Assert
+    assert len(batches) == -(-len(df) // batch_rows)  # Ceiling division
+    pd.testing.assert_frame_equal(result_df, df.reset_index(drop=True))
+
+def test_stream_arrow_empty_frame():
+    """
+    Test that an empty result is still a readable stream carrying the schema, without record batches
+    """
+    # Arrange
+    pa = pytest.importorskip("pyarrow")
+
+    # Act
+    reader = pa.ipc.open_stream(b"".join(_stream_arrow(_DF.iloc[0:0])))
+
+    # Assert
+    assert reader.schema.names == list(_DF.columns)
+    assert list(reader) == []
+
+
+""" Tests for /fetch parameter validation """
+
+@pytest.fixture
+def client():
+    """
+    TestClient for the API, skipping the endpoint tests when httpx (needed by starlette's TestClient) is missing
+    """
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    return TestClient(app)
+
+@pytest.mark.parametrize("params, expected_detail", [
+    pytest.param({"databases": "database1", "date_col": "TimeStamp; DROP TABLE x"}, "Invalid date column name", id="invalid_date_col"),
+    pytest.param({"databases": "database1", "last_n": 0}, "last_n must be a positive integer", id="zero_last_n"),
+    pytest.param({"databases": "database1", "last_n": -5}, "last_n must be a positive integer", id="negative_last_n"),
+    pytest.param({"databases": " , "}, "databases is required", id="no_databases"),
+    pytest.param({"databases": "database1", "columns": "RefName,a;b"}, "Invalid column name: a;b", id="invalid_column"),
+])
+def test_fetch_rejects_invalid_parameters(client, monkeypatch, params, expected_detail):
+    """
+    Test that parameters build_query would reject return 400 before any database is queried
+    """
+    # Arrange
+    mock_fetch = Mock()
+    monkeypatch.setattr(rest.fetcher, "fetch", mock_fetch)
+
+    # Act
+    response = client.get("/fetch", params=params)
+
+    # Assert
+    assert response.status_code == 400
+    assert expected_detail in response.json()["detail"]
+    mock_fetch.assert_not_called()
+
+def test_fetch_valid_parameters(client, monkeypatch):
+    """
+    Test that valid parameters reach the fetcher and the result is streamed as JSON
+    """
+    # Arrange
+    mock_fetch = Mock(return_value=_DF)
+    monkeypatch.setattr(rest.fetcher, "fetch", mock_fetch)
+
+    # Act
+    response = client.get("/fetch", params={"databases": "database1,database2", "last_n": 5, "reference": "V123%"})
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()["rows"] == len(_DF)
+    mock_fetch.assert_called_once_with(["database1", "database2"], [("RefName", "LIKE", "V123%")], 5, "TimeStamp", None)
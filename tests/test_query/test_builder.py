@@ -1,19 +1,22 @@
+import logging
 import pytest
 from src.query.builder import build_query, parse_filter_string
 
 
 """ Tests for parse_filter_string """
 
-def test_parse_filter_string_valid():
+@pytest.mark.parametrize("filter_str, expected_column, expected_operator, expected_value", [
+    pytest.param("RefName LIKE V123456", "RefName", "LIKE", "V123456", id="valid"),
+    pytest.param("Description LIKE Part Number ABC 123", "Description", "LIKE", "Part Number ABC 123", id="spaces_in_value"),
+    pytest.param("Status not  like ACT%", "Status", "NOT LIKE", "ACT%", id="two_word_operator_case_insensitive"),
+    # Whitespace inside the value is collapsed to single spaces, newlines included
+    pytest.param("Note = line1\nline2", "Note", "=", "line1 line2", id="multiline_value"),
+    pytest.param("Description LIKE Part  Number", "Description", "LIKE", "Part Number", id="repeated_spaces_in_value"),
+])
+def test_parse_filter_string(filter_str, expected_column, expected_operator, expected_value):
     """
-    Test parsing a valid filter string with common operators
+    Test parsing valid filter strings into (column, operator, value)
     """
-    # Arrange
-    filter_str = "RefName LIKE V123456"
-    expected_column = "RefName"
-    expected_operator = "LIKE"
-    expected_value = "V123456"
-
     # Act
     column, operator, value = parse_filter_string(filter_str)
 
@@ -22,359 +25,184 @@ def test_parse_filter_string_valid():
     assert operator == expected_operator
     assert value == expected_value
 
-def test_parse_filter_string_valid_with_spaces_in_value():
+@pytest.mark.parametrize("invalid_filter_str, expected_error", [
+    pytest.param("RefName = ", "Invalid filter format", id="missing_parts"),
+    pytest.param("RefName; DROP TABLE users; -- = 5", "Invalid column name", id="invalid_column_name"),
+    pytest.param("Refname EXEC sp_drop_all_tables", "Invalid operator", id="invalid_operator"),
+    # isidentifier() alone would accept non-ASCII identifiers
+    pytest.param("Wartość = 5", "Invalid column name", id="non_ascii_column_name"),
+])
+def test_parse_filter_string_invalid(invalid_filter_str, expected_error):
     """
-    Test parsing a valid filter string where the value contains spaces
+    Test that invalid filter strings raise ValueError with the matching message
     """
-    # Arrange
-    filter_str = "Description LIKE Part Number ABC 123"
-    expected_column = "Description"
-    expected_operator = "LIKE"
-    expected_value = "Part Number ABC 123"
-    
-    # Act
-    column, operator, value = parse_filter_string(filter_str)
-    
-    # Assert
-    assert column == expected_column
-    assert operator == expected_operator
-    assert value == expected_value
-
-def test_parse_filter_string_invalid_missing_parts():
-    """
-    Test parsing an invalid filter string that doesn't have all 3 parts
-    """
-    # Arrange
-    invalid_filter_str = "RefName = "
-
     # Act & Assert
-    with pytest.raises(ValueError, match="Invalid filter format"):
-        parse_filter_string(invalid_filter_str)
-
-def test_parse_filter_string_invalid_column_name():
-    """
-    Test parsing a filter string with an invalid column name
-    """
-    # Arrange
-    invalid_filter_str = "RefName; DROP TABLE users; -- = 5"
-
-    # Act & Assert
-    with pytest.raises(ValueError, match="Invalid column name"):
-        parse_filter_string(invalid_filter_str)
-
-def test_parse_filter_string_invalid_operator():
-    """
-    Test parsing a filter string with an invalid operator
-    """
-    # Arrange
-    invalid_filter_str = "Refname EXEC sp_drop_all_tables"
-
-    # Act & Assert
-    with pytest.raises(ValueError, match="Invalid operator"):
+    with pytest.raises(ValueError, match=expected_error):
         parse_filter_string(invalid_filter_str)
 
 
 """ Tests for build_query """
 
-def test_build_query_no_filters_no_limit():
-    """
-    Test building a query with no filters and no limit
-    """
-    # Arrange
-    table = "my_table"
-    filters = []
-    expected_query = f"SELECT * FROM `{table}`"
-    expected_params = {}
-
-    # Act
-    query, params = build_query(table, filters)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_single_filter():
-    """
-    Test building a query with a single filter
+@pytest.mark.parametrize("filters, kwargs, expected_query, expected_params", [
+    pytest.param([], {}, "SELECT * FROM `my_table`", {}, id="no_filters_no_limit"),
+    pytest.param(["RefName = ABC123"], {},
+                 "SELECT * FROM `my_table` WHERE `RefName` = :param_0", {"param_0": "ABC123"},
+                 id="single_filter"),
+    pytest.param(["RefName = ABC123", "Status = ACTIVE"], {},
+                 "SELECT * FROM `my_table` WHERE `RefName` = :param_0 AND `Status` = :param_1",
+                 {"param_0": "ABC123", "param_1": "ACTIVE"},
+                 id="multiple_filters"),
+    pytest.param(["Status = ACTIVE"], {"limit": 100},
+                 "SELECT * FROM `my_table` WHERE `Status` = :param_0 ORDER BY `TimeStamp` DESC LIMIT 100", {"param_0": "ACTIVE"},
+                 id="limit_default_date_column"),
+    pytest.param(["Status = ACTIVE"], {"limit": 50, "date_column": "timestamp"},
+                 "SELECT * FROM `my_table` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 50", {"param_0": "ACTIVE"},
+                 id="limit_custom_date_column"),
+    # "Load more" page continuing below the last fetched date
+    pytest.param(["Status = ACTIVE"], {"limit": 100, "keyset": "2025-01-01 12:00:00"},
+                 "SELECT * FROM `my_table` WHERE `Status` = :param_0 AND `TimeStamp` < :param_keyset ORDER BY `TimeStamp` DESC LIMIT 100",
+                 {"param_0": "ACTIVE", "param_keyset": "2025-01-01 12:00:00"},
+                 id="keyset_pagination"),
+    pytest.param(["RefName LIKE V123%"], {},
+                 "SELECT * FROM `my_table` WHERE `RefName` LIKE :param_0", {"param_0": "V123%"},
+                 id="like_filter"),
+    # LIKE patterns without wildcards are emitted as equality checks
+    pytest.param(["RefName LIKE V123456"], {},
+                 "SELECT * FROM `my_table` WHERE `RefName` = :param_0", {"param_0": "V123456"},
+                 id="like_without_wildcards"),
+    # = would ignore the trailing space under PAD SPACE collations, LIKE doesn't
+    pytest.param([("RefName", "LIKE", "V123456 ")], {},
+                 "SELECT * FROM `my_table` WHERE `RefName` LIKE :param_0", {"param_0": "V123456 "},
+                 id="like_with_trailing_space"),
+    pytest.param(["RefName NOT LIKE V123456"], {},
+                 "SELECT * FROM `my_table` WHERE `RefName` != :param_0", {"param_0": "V123456"},
+                 id="not_like_without_wildcards"),
+    pytest.param(["Status IN ACTIVE,PENDING"], {},
+                 "SELECT * FROM `my_table` WHERE `Status` IN :param_0", {"param_0": ["ACTIVE", "PENDING"]},
+                 id="in_filter"),
+    # IN list items are stripped and empty items dropped
+    pytest.param(["Status IN ACTIVE , PENDING ,, DONE"], {},
+                 "SELECT * FROM `my_table` WHERE `Status` IN :param_0", {"param_0": ["ACTIVE", "PENDING", "DONE"]},
+                 id="in_filter_strips_values"),
+    pytest.param(["Value > 100"], {},
+                 "SELECT * FROM `my_table` WHERE `Value` > :param_0", {"param_0": "100"},
+                 id="greater_than_filter"),
+    #TODO: add more tests for all operators <, >=, <=, !=, IS, IS NOT
+    pytest.param(["Status = ACTIVE", "Priority > 5"], {"database": "prod_db", "param_prefix": "db1_param"},
+                 "SELECT * FROM `prod_db`.`my_table` WHERE `Status` = :db1_param_0 AND `Priority` > :db1_param_1",
+                 {"db1_param_0": "ACTIVE", "db1_param_1": "5"},
+                 id="qualified_table_and_param_prefix"),
+    # Tuples from parse_filters give the same query as the filter strings
+    pytest.param([("Status", "=", "ACTIVE"), ("RefName", "LIKE", "V123%")], {},
+                 "SELECT * FROM `my_table` WHERE `Status` = :param_0 AND `RefName` LIKE :param_1",
+                 {"param_0": "ACTIVE", "param_1": "V123%"},
+                 id="parsed_filter_tuples"),
+])
+def test_build_query(filters, kwargs, expected_query, expected_params):
+    """
+    Test building queries for each filter shape and option
     """
-    # Arrange
-    table = "my_table"
-    filters = ["RefName = ABC123"]
-    expected_query = f"SELECT * FROM `{table}` WHERE `RefName` = :param_0"
-    expected_params = {"param_0" : "ABC123"}
-
     # Act
-    query, params = build_query(table, filters)
+    query, params = build_query("my_table", filters, **kwargs)
 
     # Assert
     assert query == expected_query
     assert params == expected_params
 
-def test_build_query_multiple_filters():
+@pytest.mark.parametrize("table, filters, kwargs, expected_error", [
+    pytest.param("my_table; DROP TABLE users; --", ["Status = ACTIVE"], {}, "Invalid table name", id="invalid_table_name"),
+    # '$' alone would have let "my_table\n" through
+    pytest.param("my_table\n", [], {}, "Invalid table name", id="trailing_newline_in_identifier"),
+    pytest.param("my_table", ["Status = ACTIVE"], {"limit": 100, "date_column": "Date; DROP TABLE users; --"},
+                 "Invalid date column name", id="invalid_date_column_name"),
+    pytest.param("my_table", [], {"database": "prod; DROP DATABASE prod; --"}, "Invalid database name", id="invalid_database_name"),
+    # Pre-parsed tuples are still checked before reaching the SQL text
+    pytest.param("my_table", [("Status; DROP TABLE x", "=", "ACTIVE")], {}, "Invalid column name", id="invalid_filter_tuple"),
+])
+def test_build_query_invalid(table, filters, kwargs, expected_error):
     """
-    Test building a query with multiple filters
+    Test that invalid identifiers raise ValueError (SQL injection protection)
     """
-    # Arrange
-    table = "my_table"
-    filters = ["RefName = ABC123", "Status = ACTIVE"]
-    expected_query = f"SELECT * FROM `{table}` WHERE `RefName` = :param_0 AND `Status` = :param_1"
-    expected_params = {"param_0": "ABC123", "param_1": "ACTIVE"}
-
-    # Act
-    query, params = build_query(table, filters)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_with_limit():
-    """
-    Test building a query with a limit and default date column
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["Status = ACTIVE"]
-    limit = 100
-    date_column = "TimeStamp"
-    expected_query = f"SELECT * FROM `{table}` WHERE `Status` = :param_0 ORDER BY `{date_column}` DESC LIMIT {limit}"
-    expected_params = {"param_0": "ACTIVE"}
-
-    # Act
-    query, params = build_query(table, filters, limit)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_with_limit_custom_date_column():
-    """
-    Test building a query with a limit and custom date column
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["Status = ACTIVE"]
-    limit = 50
-    date_column = "timestamp"
-    expected_query = f"SELECT * FROM `{table}` WHERE `Status` = :param_0 ORDER BY `{date_column}` DESC LIMIT {limit}"
-    expected_params = {"param_0": "ACTIVE"}
-
-    # Act
-    query, params = build_query(table, filters, limit=limit, date_column=date_column)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_like_filter():
-    """
-    Test building a query with a LIKE filter
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["RefName LIKE V123%"]
-    expected_query = f"SELECT * FROM `{table}` WHERE `RefName` LIKE :param_0"
-    expected_params = {"param_0": "V123%"}
-
-    # Act
-    query, params = build_query(table, filters)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
+    # Act & Assert
+    with pytest.raises(ValueError, match=expected_error):
+        build_query(table, filters, **kwargs)
 
-def test_build_query_in_filter():
+def test_build_query_returns_independent_params():
     """
-    Test building a query with a IN filter
+    Test that cached results hand out a fresh params dict (and IN list) on every call
     """
     # Arrange
-    table = "my_table"
     filters = ["Status IN ACTIVE,PENDING"]
-    expected_query = f"SELECT * FROM `{table}` WHERE `Status` IN (:param_0,:param_1)"
-    expected_params = {"param_0": "ACTIVE", "param_1": "PENDING"}
+    _, first_params = build_query("my_table", filters)
 
     # Act
-    query, params = build_query(table, filters)
+    first_params["param_0"].append("DONE")
+    first_params["extra"] = 1
+    _, second_params = build_query("my_table", filters)
 
     # Assert
-    assert query == expected_query
-    assert params == expected_params
+    assert second_params == {"param_0": ["ACTIVE", "PENDING"]}
 
-def test_build_query_greater_than_filter():
+def test_build_query_logs_like_rewrite_on_every_call(caplog):
     """
-    Test building a query with a > filter
+    Test that the LIKE -> = rewrite is logged for cached queries too, not only when first built
     """
     # Arrange
-    table = "my_table"
-    filters = ["Value > 100"]
-    expected_query = f"SELECT * FROM `{table}` WHERE `Value` > :param_0"
-    expected_params = {"param_0": "100"}
+    filters = ["RefName LIKE V123456"]
+    build_query("my_table", filters)
 
     # Act
-    query, params = build_query(table, filters)
+    with caplog.at_level(logging.DEBUG, logger="src.query.builder"):
+        build_query("my_table", filters)
 
     # Assert
-    assert query == expected_query
-    assert params == expected_params
+    assert "Rewriting RefName LIKE 'V123456' as =" in caplog.messages
 
-#TODO: add more tests for all operators <, >=, <=, !=, IS, IS NOT
 
-def test_build_query_invalid_table_name():
-    """
-    Test building a query with an invalid table name (should raise ValueError)
-    """
-    # Arrange
-    table = "my_table; DROP TABLE users; --"
-    filters = ["Status = ACTIVE"]
-
-    # Act & Assert
-    with pytest.raises(ValueError, match="Invalid table name"):
-        build_query(table, filters)
-
-def test_build_query_invalid_date_column_name():
-    """
-    Test building a query with an invalid date column name (should raise ValueError)
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["Status = ACTIVE"]
-    limit = 100
-    date_column = "Date; DROP TABLE users; --"
-
-    # Act & Assert
-    with pytest.raises(ValueError, match="Invalid date column name"):
-        build_query(table, filters, limit=limit, date_column=date_column)
 
 """ Unit tests for --select-column functionality """
 
-def test_build_query_with_select_columns_list():
-    """
-    Test building a query with a specific list fo columns selected
-    Expected: Query should start with SELECT col1, col2, ...
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["RefName = ABC123"]
-    columns = ["RefName", "Date", "Status"]
-    limit = 10
-    date_column = "Date"
-
-    expected_select_clause = "SELECT `RefName`, `Date`, `Status`"
-    expected_query_body = " FROM `my_table` WHERE `RefName` = :param_0 ORDER BY `Date` DESC LIMIT 10"
-    expected_query = expected_select_clause + expected_query_body
-    expected_params = {"param_0": "ABC123"}
-
-    # Act
-    query, params = build_query(table, filters, limit, date_column, columns)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_with_select_columns_no_filters_no_limit():
-    """
-    Test building a query with columns selected but no filters or limit
-    Expected: Query should be SELECT col1, col2, ... FROM table
-    """
-    # Arrange
-    table = "my_table"
-    filters = []
-    columns = ["ID", "Name"]
-    limit = None # NO LIMIT :D
-    date_column = "Date"
-
-    expected_query = "SELECT `ID`, `Name` FROM `my_table`"
-    expected_params = {}
-
-    # Act
-    query, params = build_query(table, filters, limit, date_column, columns)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_with_select_columns_and_filters():
-    """
-    Test building a query with columns selected and filters applied
-    Expected: Query should be SELECT col1, ... FROM table WHERE ...
+@pytest.mark.parametrize("filters, columns, limit, expected_query, expected_params", [
+    pytest.param(["RefName = ABC123"], ["RefName", "Date", "Status"], 10,
+                 "SELECT `RefName`, `Date`, `Status` FROM `my_table` WHERE `RefName` = :param_0 ORDER BY `Date` DESC LIMIT 10",
+                 {"param_0": "ABC123"},
+                 id="columns_list"),
+    pytest.param([], ["ID", "Name"], None, # NO LIMIT :D
+                 "SELECT `ID`, `Name` FROM `my_table`", {},
+                 id="columns_no_filters_no_limit"),
+    pytest.param(["Status = ACTIVE", "Date >= 2025-01-01"], ["RefName", "Status", "Date"], None,
+                 "SELECT `RefName`, `Status`, `Date` FROM `my_table` WHERE `Status` = :param_0 AND `Date` >= :param_1",
+                 {"param_0": "ACTIVE", "param_1": "2025-01-01"},
+                 id="columns_and_filters"),
+    pytest.param(["Status = INACTIVE"], ["RefName", "Date"], 50,
+                 "SELECT `RefName`, `Date` FROM `my_table` WHERE `Status` = :param_0 ORDER BY `Date` DESC LIMIT 50",
+                 {"param_0": "INACTIVE"},
+                 id="columns_and_limit"),
+    # columns=None keeps the default SELECT *
+    pytest.param(["RefName LIKE V123%"], None, 100,
+                 "SELECT * FROM `my_table` WHERE `RefName` LIKE :param_0 ORDER BY `Date` DESC LIMIT 100",
+                 {"param_0": "V123%"},
+                 id="without_columns"),
+])
+def test_build_query_with_select_columns(filters, columns, limit, expected_query, expected_params):
+    """
+    Test building queries with and without an explicit SELECT list
     """
-    # Arrange
-    table = "my_table"
-    filters = ["Status = ACTIVE", "Date >= 2025-01-01"]
-    columns = ["RefName", "Status", "Date"]
-    limit = None
-    date_column = "Date"
-
-    expected_query = "SELECT `RefName`, `Status`, `Date` FROM `my_table` WHERE `Status` = :param_0 AND `Date` >= :param_1"
-    expected_params = {"param_0": "ACTIVE", "param_1": "2025-01-01"}
-
     # Act
-    query, params = build_query(table, filters, limit, date_column, columns)
+    query, params = build_query("my_table", filters, limit, "Date", columns)
 
     # Assert
     assert query == expected_query
     assert params == expected_params
 
-def test_build_query_with_select_columns_and_limit():
-    """
-    Test building a query with columns selected and a limit applied
-    Expected: Query should be SELECT col1, ... FROM table ... ORDER BY ... LIMIT N
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["Status = INACTIVE"]
-    columns = ["RefName", "Timestamp"]
-    limit = 50
-    date_column = "Timestamp"
-
-    expected_query = "SELECT `RefName`, `Timestamp` FROM `my_table` WHERE `Status` = :param_0 ORDER BY `Timestamp` DESC LIMIT 50"
-    expected_params = {"param_0": "INACTIVE"}
-
-    # Act
-    query, params = build_query(table, filters, limit, date_column, columns)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_without_select_columns_still_works():
-    """
-    Test that the default behavior (SELECT *) still works when columns=None or not provided
-    Expected: Query should start with SELECT *
-    """
-    # Arrange
-    table = "my_table"
-    filters = ["RefName LIKE V123%"]
-    # columns = None # This is the default behavior to test
-    limit = 100
-    date_column = "Date"
-
-    expected_query = "SELECT * FROM `my_table` WHERE `RefName` LIKE :param_0 ORDER BY `Date` DESC LIMIT 100"
-    expected_params = {"param_0": "V123%"}
-
-    # Act
-    query, params = build_query(table, filters, limit, date_column, columns=None)
-
-    # Assert
-    assert query == expected_query
-    assert params == expected_params
-
-def test_build_query_select_columns_validation():
+@pytest.mark.parametrize("invalid_columns", [
+    pytest.param(["RefName", "Date; DROP TABLE users; --"], id="one_of_many"),
+    pytest.param(["SomeName' OR '1'='1"], id="single"),
+])
+def test_build_query_select_columns_validation(invalid_columns):
     """
     Test that build_query rejects invalid column names to prevent SQL injection
-    Expected: ValueError should be raised for invalid column names
     """
-    # Arrange
-    table = "my_table"
-    filters = []
-    invalid_columns = ["RefName", "Date; DROP TABLE users; --"]
-    limit = None
-    date_column = "Date"
-
     # Act & Assert
     with pytest.raises(ValueError, match="Invalid column name"):
-        build_query(table, filters, limit, date_column, invalid_columns)
-
-    single_invalid_column = ["SomeName' OR '1'='1"]
-    with pytest.raises(ValueError, match="Invalid column name"):
-        build_query(table, filters, limit, date_column, single_invalid_column)
-
+        build_query("my_table", [], None, "Date", invalid_columns)
@@ -0,0 +1,34 @@
+import pytest
+from src.services.filter_parser import parse_filter_string, parse_filters
+
+
+@pytest.mark.parametrize("operator", ["=", "!=", "<>", "<", ">", "<=", ">="])
+def test_parse_filter_string_comparison_operators(operator):
+    """
+    Test that every comparison operator is accepted
+    """
+    # Arrange
+    filter_str = f"Value {operator} 100"
+
+    # Act
+    column, parsed_operator, value = parse_filter_string(filter_str)
+
+    # Assert
+    assert column == "Value"
+    assert parsed_operator == operator
+    assert value == "100"
+
+def test_parse_filters_returns_filters_and_limit():
+    """
+    Test that valid filters are returned parsed, together with the limit
+    """
+    # Arrange
+    filters = ["Status = ACTIVE", "Priority >= 5"]
+    last = 10
+    expected_filters = [("Status", "=", "ACTIVE"), ("Priority", ">=", "5")]
+
+    # Act
+    result = parse_filters(filters, last)
+
+    # Assert
+    assert result == {"filters": expected_filters, "limit": last}
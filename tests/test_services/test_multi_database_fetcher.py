@@ -1,379 +1,272 @@
 import pytest
 import pandas as pd
-from unittest.mock import patch, Mock, call
+from dataclasses import dataclass, field
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock, call
+from src.query.builder import build_query
 from src.services.multi_database_fetcher import MultiDatabaseFetcher
 
 
-@patch("src.services.multi_database_fetcher.fetch_data")
-@patch("src.services.multi_database_fetcher.build_query")
-@patch("src.services.multi_database_fetcher.DBManager")
-def test_fetch_single_database_success(mock_db_manager_class, mock_build_query, mock_fetch_data):
+def _expected(frames: dict, databases: tuple, categories: list):
+    """
+    Expected fetch result: the databases' frames tagged with source_database and combined
+    categories: every requested database
+    """
+    source_dtype = pd.CategoricalDtype(categories=categories)
+    tagged = [frames[database].assign(source_database=pd.Categorical([database] * len(frames[database]), dtype=source_dtype))
+              for database in databases]
+    return pd.concat(tagged, ignore_index=True)
+
+# Shared inputs of the per-database fetch scenarios, read-only so no test can change them for the next one
+_CFG = MappingProxyType({
+    "database1": MappingProxyType({"table": "table1"}),
+    "database2": MappingProxyType({"table": "table2"})
+})
+_FILTERS = ["Status = ACTIVE"]
+_LIMIT = 5
+_DATE_COLUMN = "timestamp"
+_BOTH = ("database1", "database2")
+_QUERY = "SELECT * FROM `table1` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 5"
+_PARAMS = {"param_0": "ACTIVE"}
+
+
+@dataclass(frozen=True)
+class _Scenario:
+    """ One MultiDatabaseFetcher.fetch run over databases queried one by one (no UNION ALL grouping) """
+    id: str
+    databases: list
+    frames: dict  # database -> name of the conftest fixture holding the frame returned by fetch_data
+    expected: tuple = ()  # Databases whose rows make up the combined result, empty when it should be empty
+    failing_engines: set = field(default_factory=set)  # get_engine raises
+    failing_tables: set = field(default_factory=set)  # build_query raises
+
+
+_SCENARIOS = [
+    _Scenario("single_database", ["database1"], {"database1": "df_db1"}, ("database1",)),
+    _Scenario("multiple_databases", ["database1", "database2"], {"database1": "df_db1", "database2": "df_db2"}, _BOTH),
+    # database2's thread fails on get_engine, so neither build_query nor fetch_data run for it
+    _Scenario("connection_failure_one_db", ["database1", "database2"], {"database1": "df_db1"}, ("database1",),
+              failing_engines={"database2"}),
+    # database2's thread fails on build_query, so fetch_data only runs for database1
+    _Scenario("query_build_failure_one_db", ["database1", "database2"], {"database1": "df_db1"}, ("database1",),
+              failing_tables={"table2"}),
+    _Scenario("data_empty_one_db", ["database1", "database2"], {"database1": "df_db1", "database2": "df_empty"}, ("database1",)),
+    _Scenario("no_data_any_db", ["database1", "database2"], {"database1": "df_empty", "database2": "df_empty"}),
+]
+
+
+def _assert_calls_unordered(mock, expected_calls):
+    """
+    Assert mock got exactly expected_calls, in any order (worker threads finish in any order)
+    Compares sorted call reprs instead of assert_has_calls(any_order=True), which rescans the calls per expected one
+    """
+    assert sorted(map(str, mock.call_args_list)) == sorted(map(str, expected_calls))
+
+
+@pytest.fixture
+def mocks(monkeypatch):
+    """
+    Replace the fetcher module's collaborators with plain Mocks, restored by monkeypatch after each test
+    """
+    ns = SimpleNamespace(db_manager_cls=Mock(), build_query=Mock(), fetch_data=Mock(), get_credentials=Mock())
+    monkeypatch.setattr("src.services.multi_database_fetcher.DBManager", ns.db_manager_cls)
+    monkeypatch.setattr("src.services.multi_database_fetcher.build_query", ns.build_query)
+    monkeypatch.setattr("src.services.multi_database_fetcher.fetch_data", ns.fetch_data)
+    monkeypatch.setattr("src.services.multi_database_fetcher.get_credentials", ns.get_credentials)
+    return ns
+
+
+@pytest.mark.parametrize("scenario", _SCENARIOS, ids=lambda scenario: scenario.id)
+def test_fetch(mocks, scenario, request):
     # Assign
+    frames = {database: request.getfixturevalue(name) for database, name in scenario.frames.items()}
+
     mock_db_manager_instance = Mock()
-    mock_db_manager_class.return_value = mock_db_manager_instance
+    mocks.db_manager_cls.return_value = mock_db_manager_instance
+    mock_db_manager_instance.cfg = _CFG
 
-    mock_engine = Mock()
-    mock_db_manager_instance.get_engine.return_value = mock_engine
-    mock_db_manager_instance.cfg = {
-        "database1": {"table": "table1"}
-    }
+    # Engines are only passed through to fetch_data, a named stub is enough
+    engines = {database: SimpleNamespace(name=database) for database in scenario.databases}
 
-    filters = ["RefName = ABC123"]
-    limit = 10
-    date_column = "Date"
+    # Side effects run inside the worker threads, so exceptions are raised where the real calls would fail
+    def get_engine_side_effect(database):
+        if database in scenario.failing_engines:
+            raise Exception("Connection failed")
+        return engines[database]
+
+    def build_query_side_effect(table, filters_arg, limit_arg, date_column_arg, columns_arg=None):
+        if table in scenario.failing_tables:
+            raise ValueError(f"Invalid column name in filter for {table}")
+        return _QUERY, _PARAMS
 
-    expected_query = "SELECT * FROM `table1` WHERE `RefName` = :param_0 ORDER BY `Date` DESC LIMIT 10"
-    expected_params = {"param_0": "ABC123"}
-    expected_df_from_db = pd.DataFrame({"col1": [1, 2], "col2": ['a', 'b']})
-    expected_final_df = expected_df_from_db.copy()
-    expected_final_df["source_database"] = "database1"
+    def fetch_data_side_effect(engine, query, params):
+        # fetch tags the returned frame in place, so hand out a copy of the session fixture
+        return frames[engine.name].copy()
+
+    mock_db_manager_instance.get_engine.side_effect = get_engine_side_effect
+    mocks.build_query.side_effect = build_query_side_effect
+    mocks.fetch_data.side_effect = fetch_data_side_effect
 
-    mock_build_query.return_value = expected_query, expected_params
-    mock_fetch_data.return_value = expected_df_from_db
+    queried = [database for database in scenario.databases if database not in scenario.failing_engines]
+    fetched = [database for database in queried if _CFG[database]["table"] not in scenario.failing_tables]
 
     fetcher = MultiDatabaseFetcher()
     fetcher.db = mock_db_manager_instance
 
     # Act
-    result_df = fetcher.fetch(["database1"], filters, limit, date_column)
+    result_df = fetcher.fetch(scenario.databases, _FILTERS, _LIMIT, _DATE_COLUMN)
 
     # Assert
-    mock_db_manager_instance.get_engine.assert_called_once_with("database1")
-    mock_build_query.assert_called_once_with("table1", filters, limit, date_column, None)
-    mock_fetch_data.assert_called_once_with(mock_engine, expected_query, expected_params)
-    pd.testing.assert_frame_equal(result_df, expected_final_df)
+    _assert_calls_unordered(mock_db_manager_instance.get_engine, [call(database) for database in scenario.databases])
+    _assert_calls_unordered(mocks.build_query, [
+        call(_CFG[database]["table"], _FILTERS, _LIMIT, _DATE_COLUMN, None) for database in queried
+    ])
+    _assert_calls_unordered(mocks.fetch_data, [call(engines[database], _QUERY, _PARAMS) for database in fetched])
+
+    if not scenario.expected:
+        assert result_df.empty
+    else:
+        # Databases finish in any order, each one's rows keep theirs (stable sort on the tag only)
+        sorted_result_df = result_df.sort_values("source_database", kind="stable").reset_index(drop=True)
+        pd.testing.assert_frame_equal(sorted_result_df, _expected(frames, scenario.expected, scenario.databases), check_like=True)
 
 
-@patch("src.services.multi_database_fetcher.fetch_data")
-@patch("src.services.multi_database_fetcher.build_query")
-@patch("src.services.multi_database_fetcher.DBManager")
-def test_fetch_multiple_databases_success(mock_db_manager_class, mock_build_query, mock_fetch_data):
+def test_fetch_same_server_databases_with_union_all(mocks):
     # Assign
     mock_db_manager_instance = Mock()
-    mock_db_manager_class.return_value = mock_db_manager_instance
+    mocks.db_manager_cls.return_value = mock_db_manager_instance
 
-    mock_engine1 = Mock()
-    mock_engine2 = Mock()
-    mock_db_manager_instance.get_engine.side_effect = lambda x: mock_engine1 if x == "database1" else mock_engine2
+    mock_engine = SimpleNamespace(name="server1")
+    mock_db_manager_instance.get_engine.return_value = mock_engine
     mock_db_manager_instance.cfg = {
-        "database1": {"table": "table1"},
-        "database2": {"table": "table2"}
+        "database1": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod1", "table": "table1"},
+        "database2": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod2", "table": "table2"}
     }
+    mocks.get_credentials.return_value = ("user", "password")
+    mocks.build_query.side_effect = build_query
 
     filters = ["Status = ACTIVE"]
     limit = 5
     date_column = "timestamp"
+    columns = ["col1", "timestamp"]
 
-    expected_query = "SELECT * FROM `table1` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 5"
-    expected_params = {"param_0": "ACTIVE"}
-
-    expected_df_db1 = pd.DataFrame({"col1": [1, 2], "col2": ['a', 'b']})
-    expected_df_db2 = pd.DataFrame({"col1": [3, 4], "col2": ['c', 'd']})
+    expected_query = (
+        "SELECT t0.*, :db0_source AS source_database FROM "
+        "(SELECT `col1`, `timestamp` FROM `prod1`.`table1` WHERE `Status` = :db0_param_0 ORDER BY `timestamp` DESC LIMIT 5) AS t0"
+        " UNION ALL "
+        "SELECT t1.*, :db1_source AS source_database FROM "
+        "(SELECT `col1`, `timestamp` FROM `prod2`.`table2` WHERE `Status` = :db1_param_0 ORDER BY `timestamp` DESC LIMIT 5) AS t1"
+    )
+    expected_params = {"db0_param_0": "ACTIVE", "db0_source": "database1", "db1_param_0": "ACTIVE", "db1_source": "database2"}
 
-    expected_final_df_db1 = expected_df_db1.copy()
-    expected_final_df_db1["source_database"] = "database1"
-    expected_final_df_db2 = expected_df_db2.copy()
-    expected_final_df_db2["source_database"] = "database2"
-    expected_combined_df = pd.concat([expected_final_df_db1, expected_final_df_db2], ignore_index=True)
+    mocks.fetch_data.return_value = pd.DataFrame({"col1": [1, 3], "source_database": ["database1", "database2"]})
 
-    mock_build_query.return_value = expected_query, expected_params
-
-    def mock_fetch_data_side_effect(engine, query, params):
-        if engine == mock_engine1:
-            return expected_df_db1
-        elif engine == mock_engine2:
-            return expected_df_db2
-        else:
-            return pd.DataFrame()
-
-    mock_fetch_data.side_effect = mock_fetch_data_side_effect
+    expected_df = pd.DataFrame({"col1": [1, 3], "source_database": pd.Categorical(["database1", "database2"])})
 
     fetcher = MultiDatabaseFetcher()
     fetcher.db = mock_db_manager_instance
 
     # Act
-    result_df = fetcher.fetch(["database1", "database2"], filters, limit, date_column)
+    result_df = fetcher.fetch(["database1", "database2"], filters, limit, date_column, columns)
 
     # Assert
-    assert mock_db_manager_instance.get_engine.call_count == 2
-    mock_db_manager_instance.get_engine.assert_has_calls([call("database1"), call("database2")], any_order=True)
-    assert mock_build_query.call_count == 2
-    mock_build_query.assert_has_calls([
-        call("table1", filters, limit, date_column, None),
-        call("table2", filters, limit, date_column, None)
-    ], any_order=True)
-    assert mock_fetch_data.call_count == 2
-    mock_fetch_data.assert_has_calls([
-        call(mock_engine1, expected_query, expected_params),
-        call(mock_engine2, expected_query, expected_params)
-    ], any_order=True)
-
-    sorted_result_df = result_df.sort_values(by=result_df.columns.tolist()).reset_index(drop=True)
-    sorted_expected_df = expected_combined_df.sort_values(by=expected_combined_df.columns.tolist()).reset_index(drop=True)
-    pd.testing.assert_frame_equal(sorted_result_df, sorted_expected_df)
-
-
-@patch("src.services.multi_database_fetcher.fetch_data")
-@patch("src.services.multi_database_fetcher.build_query")
-@patch("src.services.multi_database_fetcher.DBManager")
-def test_fetch_connection_failure_one_db(mock_db_manager_class, mock_build_query, mock_fetch_data):
-    # Assign
-    mock_db_manager_instance = Mock()
-    mock_db_manager_class.return_value = mock_db_manager_instance
-
-    mock_engine1 = Mock()
-    # Use a function for side_effect to raise the exception correctly inside the thread
-    def get_engine_side_effect(x):
-        if x == "database1":
-            return mock_engine1
-        else:
-            raise Exception("Connection failed")
-
-    mock_db_manager_instance.get_engine.side_effect = get_engine_side_effect
-    mock_db_manager_instance.cfg = {
-        "database1": {"table": "table1"},
-        "database2": {"table": "table2"}
-    }
-
-    filters = ["Status = ACTIVE"]
-    limit = 5
-    date_column = "timestamp"
-    expected_query = "SELECT * FROM `table1` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 5"
-    expected_params = {"param_0": "ACTIVE"}
-
-    expected_df_db1 = pd.DataFrame({"col1": [1, 2], "col2": ['a', 'b']})
-    expected_final_df_db1 = expected_df_db1.copy()
-    expected_final_df_db1["source_database"] = "database1"
-
-    def mock_build_query_side_effect(table, filters_arg, limit_arg, date_column_arg, columns_arg = None):
-        if table == "table1":
-            return expected_query, expected_params
-        elif table == "table2":
-            return expected_query, expected_params
-        else:
-            raise ValueError(f"Unexpected table: {table}")
-
-    mock_build_query.side_effect = mock_build_query_side_effect
-
-    def mock_fetch_data_side_effect(engine, query, params):
-        if engine == mock_engine1:
-            return expected_df_db1
-        else:
-            # This part should not be reached for database2 due to connection failure
-            return pd.DataFrame()
-
-    mock_fetch_data.side_effect = mock_fetch_data_side_effect
-
-    fetcher = MultiDatabaseFetcher()
-    fetcher.db = mock_db_manager_instance
+    mock_db_manager_instance.get_engine.assert_called_once_with("database1")
+    mocks.fetch_data.assert_called_once_with(mock_engine, expected_query, expected_params, raise_errors=True)
+    pd.testing.assert_frame_equal(result_df, expected_df)
 
-    # Act
-    result_df = fetcher.fetch(["database1", "database2"], filters, limit, date_column, None)
 
-    # Assert
-    assert mock_db_manager_instance.get_engine.call_count == 2
-    mock_db_manager_instance.get_engine.assert_has_calls([
-        call("database1"),
-        call("database2")
-    ], any_order=True)
-    # build_query is called only for the successful database (database1) as db2's thread fails on get_engine
-    assert mock_build_query.call_count == 1
-    mock_build_query.assert_called_once_with("table1", filters, limit, date_column, None)
-    # fetch_data is called only for the successful database (database1)
-    mock_fetch_data.assert_called_once_with(mock_engine1, expected_query, expected_params)
-
-    sorted_result_df = result_df.sort_values(by=result_df.columns.tolist()).reset_index(drop=True)
-    sorted_expected_final_df_db1 = expected_final_df_db1.sort_values(by=expected_final_df_db1.columns.tolist()).reset_index(drop=True)
-    pd.testing.assert_frame_equal(sorted_result_df, sorted_expected_final_df_db1)
-
-
-@patch("src.services.multi_database_fetcher.fetch_data")
-@patch("src.services.multi_database_fetcher.build_query")
-@patch("src.services.multi_database_fetcher.DBManager")
-def test_fetch_query_build_failure_one_db(mock_db_manager_class, mock_build_query, mock_fetch_data):
+def test_fetch_union_all_failure_falls_back_to_single_queries(mocks):
     # Assign
     mock_db_manager_instance = Mock()
-    mock_db_manager_class.return_value = mock_db_manager_instance
+    mocks.db_manager_cls.return_value = mock_db_manager_instance
 
-    mock_engine1 = Mock()
-    mock_engine2 = Mock()
-    mock_db_manager_instance.get_engine.side_effect = lambda x: mock_engine1 if x == 'database1' else mock_engine2
+    mock_engine = SimpleNamespace(name="server1")
+    mock_db_manager_instance.get_engine.return_value = mock_engine
     mock_db_manager_instance.cfg = {
-        'database1': {'table': 'table1'},
-        'database2': {'table': 'table2'}
+        "database1": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod1", "table": "table1"},
+        "database2": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod2", "table": "table2"}
     }
+    mocks.get_credentials.return_value = ("user", "password")
+    mocks.build_query.side_effect = build_query
 
-    filters = ["Status = ACTIVE"]
-    limit = 5
-    date_column = "timestamp"
-    expected_query_db1 = "SELECT * FROM `table1` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 5"
-    expected_params_db1 = {"param_0": "ACTIVE"}
-
-    expected_df_db1 = pd.DataFrame({'col1': [1, 2], 'col2': ['a', 'b']})
-    expected_final_df_db1 = expected_df_db1.copy()
-    expected_final_df_db1['source_database'] = 'database1'
-
-    def mock_build_query_side_effect(table, filters_arg, limit_arg, date_column_arg, columns_arg = None):
-        if table == "table1":
-            return expected_query_db1, expected_params_db1
-        elif table == "table2":
-            raise ValueError("Invalid column name in filter for database2")
-        else:
-            raise ValueError(f"Unexpected table: {table}")
-
-    mock_build_query.side_effect = mock_build_query_side_effect
+    def mock_fetch_data_side_effect(engine, query, params, raise_errors=False):
+        if raise_errors:
+            raise Exception("The used SELECT statements have a different number of columns")
+        return pd.DataFrame({"col1": [1]}) if "table1" in query else pd.DataFrame({"col1": [2]})
 
-    def mock_fetch_data_side_effect(engine, query, params):
-        if engine == mock_engine1:
-            return expected_df_db1
-        else:
-            return pd.DataFrame()
-
-    mock_fetch_data.side_effect = mock_fetch_data_side_effect
+    mocks.fetch_data.side_effect = mock_fetch_data_side_effect
 
     fetcher = MultiDatabaseFetcher()
     fetcher.db = mock_db_manager_instance
 
     # Act
-    result_df = fetcher.fetch(['database1', 'database2'], filters, limit, date_column, None)
+    result_df = fetcher.fetch(["database1", "database2"], [], None, "timestamp", ["col1"])
 
     # Assert
-    assert mock_db_manager_instance.get_engine.call_count == 2
-    mock_db_manager_instance.get_engine.assert_has_calls([
-        call('database1'),
-        call('database2')
-    ], any_order=True)
-    assert mock_build_query.call_count == 2
-    mock_build_query.assert_has_calls([
-        call('table1', filters, limit, date_column, None),
-        call('table2', filters, limit, date_column, None)
-    ], any_order=True)
-    # fetch_data is called only for the successful database (database1) as db2's thread fails on build_query
-    mock_fetch_data.assert_called_once_with(mock_engine1, expected_query_db1, expected_params_db1)
-
-    sorted_result_df = result_df.sort_values(by=result_df.columns.tolist()).reset_index(drop=True)
-    sorted_expected_final_df_db1 = expected_final_df_db1.sort_values(by=expected_final_df_db1.columns.tolist()).reset_index(drop=True)
-    pd.testing.assert_frame_equal(sorted_result_df, sorted_expected_final_df_db1)
-
-
-@patch("src.services.multi_database_fetcher.fetch_data")
-@patch("src.services.multi_database_fetcher.build_query")
-@patch("src.services.multi_database_fetcher.DBManager")
-def test_fetch_data_empty_one_db(mock_db_manager_class, mock_build_query, mock_fetch_data):
+    assert mocks.fetch_data.call_count == 3
+    assert sorted(result_df["col1"].tolist()) == [1, 2]
+    assert sorted(result_df["source_database"].tolist()) == ["database1", "database2"]
+
+
+def test_fetch_combines_union_and_single_database_tags(mocks):
     # Assign
     mock_db_manager_instance = Mock()
-    mock_db_manager_class.return_value = mock_db_manager_instance
+    mocks.db_manager_cls.return_value = mock_db_manager_instance
 
-    mock_engine1 = Mock()
-    mock_engine2 = Mock()
-    mock_db_manager_instance.get_engine.side_effect = lambda x: mock_engine1 if x == 'database1' else mock_engine2
+    mock_db_manager_instance.get_engine.return_value = SimpleNamespace(name="server1")
     mock_db_manager_instance.cfg = {
-        'database1': {'table': 'table1'},
-        'database2': {'table': 'table2'}
+        "database1": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod1", "table": "table1"},
+        "database2": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod2", "table": "table2"},
+        "database3": {"type": "mysql", "host": "10.0.0.2", "port": 3306, "database": "prod3", "table": "table3"}
     }
+    mocks.get_credentials.return_value = ("user", "password")
+    mocks.build_query.side_effect = build_query
 
-    filters = ["Status = ACTIVE"]
-    limit = 5
-    date_column = "timestamp"
-    expected_query = "SELECT * FROM `table1` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 5"
-    expected_params = {"param_0": "ACTIVE"}
-
-    expected_df_db1 = pd.DataFrame({'col1': [1, 2], 'col2': ['a', 'b']})
-    expected_df_db2_empty = pd.DataFrame()
-
-    expected_final_df_db1 = expected_df_db1.copy()
-    expected_final_df_db1['source_database'] = 'database1'
-    expected_result_df = expected_final_df_db1
+    # UNION ALL results tag rows with a string column, single database results with a categorical
+    def mock_fetch_data_side_effect(engine, query, params, raise_errors=False):
+        if raise_errors:
+            return pd.DataFrame({"col1": [1, 3], "source_database": pd.array(["database1", "database2"], dtype="string")})
+        return pd.DataFrame({"col1": [5]})
 
-    mock_build_query.return_value = expected_query, expected_params
+    mocks.fetch_data.side_effect = mock_fetch_data_side_effect
 
-    def mock_fetch_data_side_effect(engine, query, params):
-        if engine == mock_engine1:
-            return expected_df_db1
-        elif engine == mock_engine2:
-            return expected_df_db2_empty
-        else:
-            return pd.DataFrame()
-
-    mock_fetch_data.side_effect = mock_fetch_data_side_effect
+    expected_df = pd.DataFrame({"col1": [1, 3, 5], "source_database": pd.Categorical(["database1", "database2", "database3"])})
 
     fetcher = MultiDatabaseFetcher()
     fetcher.db = mock_db_manager_instance
 
     # Act
-    result_df = fetcher.fetch(['database1', 'database2'], filters, limit, date_column, None)
-    sorted_result_df = result_df.sort_values(by=result_df.columns.tolist()).reset_index(drop=True)
-    sorted_expected_result_df = expected_result_df.sort_values(by=expected_result_df.columns.tolist()).reset_index(drop=True)
+    result_df = fetcher.fetch(["database1", "database2", "database3"], [], None, "timestamp", ["col1"])
 
     # Assert
-    assert mock_db_manager_instance.get_engine.call_count == 2
-    mock_db_manager_instance.get_engine.assert_has_calls([
-        call('database1'),
-        call('database2')
-    ], any_order=True)
-    assert mock_build_query.call_count == 2
-    mock_build_query.assert_has_calls([
-        call('table1', filters, limit, date_column, None),
-        call('table2', filters, limit, date_column, None)
-    ], any_order=True)
-    assert mock_fetch_data.call_count == 2
-    mock_fetch_data.assert_has_calls([
-        call(mock_engine1, expected_query, expected_params),
-        call(mock_engine2, expected_query, expected_params)
-    ], any_order=True)
-    pd.testing.assert_frame_equal(sorted_result_df, sorted_expected_result_df)
-
-
-@patch("src.services.multi_database_fetcher.fetch_data")
-@patch("src.services.multi_database_fetcher.build_query")
-@patch("src.services.multi_database_fetcher.DBManager")
-def test_fetch_no_data_any_db(mock_db_manager_class, mock_build_query, mock_fetch_data):
+    assert mocks.fetch_data.call_count == 2
+    pd.testing.assert_frame_equal(result_df.sort_values("col1").reset_index(drop=True), expected_df)
+
+
+def test_fetch_same_server_databases_without_columns_skips_union_all(mocks):
     # Assign
     mock_db_manager_instance = Mock()
-    mock_db_manager_class.return_value = mock_db_manager_instance
+    mocks.db_manager_cls.return_value = mock_db_manager_instance
 
-    mock_engine1 = Mock()
-    mock_engine2 = Mock()
-    mock_db_manager_instance.get_engine.side_effect = lambda x: mock_engine1 if x == 'database1' else mock_engine2
+    mock_db_manager_instance.get_engine.return_value = SimpleNamespace(name="server1")
     mock_db_manager_instance.cfg = {
-        'database1': {'table': 'table1'},
-        'database2': {'table': 'table2'}
+        "database1": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod1", "table": "table1"},
+        "database2": {"type": "mysql", "host": "10.0.0.1", "port": 3306, "database": "prod2", "table": "table2"}
     }
-
-    filters = ["Status = INACTIVE"]
-    limit = 5
-    date_column = "timestamp"
-    expected_query = "SELECT * FROM `table1` WHERE `Status` = :param_0 ORDER BY `timestamp` DESC LIMIT 5"
-    expected_params = {"param_0": "INACTIVE"}
-
-    expected_df_empty = pd.DataFrame()
-
-    mock_build_query.return_value = expected_query, expected_params
-
-    def mock_fetch_data_side_effect(engine, query, params):
-        return expected_df_empty
-
-    mock_fetch_data.side_effect = mock_fetch_data_side_effect
+    mocks.get_credentials.return_value = ("user", "password")
+    mocks.build_query.side_effect = build_query
+    # UNION ALL pairs SELECT * columns by position, so tables with the same columns in another order would mix up
+    mocks.fetch_data.side_effect = lambda engine, query, params: pd.DataFrame({"col1": [1]})
 
     fetcher = MultiDatabaseFetcher()
     fetcher.db = mock_db_manager_instance
 
     # Act
-    result_df = fetcher.fetch(['database1', 'database2'], filters, limit, date_column, None)
+    result_df = fetcher.fetch(["database1", "database2"], [], None, "timestamp")
 
     # Assert
-    assert mock_db_manager_instance.get_engine.call_count == 2
-    mock_db_manager_instance.get_engine.assert_has_calls([call('database1'), call('database2')], any_order=True)
-    assert mock_build_query.call_count == 2
-    mock_build_query.assert_has_calls([
-        call('table1', filters, limit, date_column, None),
-        call('table2', filters, limit, date_column, None)
-    ], any_order=True)
-    assert mock_fetch_data.call_count == 2
-    mock_fetch_data.assert_has_calls([
-        call(mock_engine1, expected_query, expected_params),
-        call(mock_engine2, expected_query, expected_params)
-    ], any_order=True)
-    assert result_df.empty
-    assert result_df.shape[0] == 0
-
+    _assert_calls_unordered(mocks.fetch_data, [
+        call(mock_db_manager_instance.get_engine.return_value, "SELECT * FROM `table1`", {}),
+        call(mock_db_manager_instance.get_engine.return_value, "SELECT * FROM `table2`", {}),
+    ])
+    assert sorted(result_df["source_database"].tolist()) == ["database1", "database2"]
@@ -1,19 +1,27 @@
+import importlib
+import os
 import pytest
-from unittest.mock import patch, Mock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock, MagicMock
 import pandas as pd
 from sqlalchemy import text
 
 
 """ Test 1: can we import the main modules without errors? """
 def test_import_core_modules():
-    try:
-        import src.db.manager
-        import src.query.builder
-        import src.query.fetcher
-        import src.services.multi_database_fetcher
-        import src.cli.main
-        import src.storage.exporter
+    modules = [
+        "src.db.manager",
+        "src.query.builder",
+        "src.query.fetcher",
+        "src.services.multi_database_fetcher",
+        "src.cli.main",
+        "src.storage.exporter",
         #TODO: add other modues after implementation
+    ]
+    try:
+        # Imports run side by side, the import lock still builds each module once
+        with ThreadPoolExecutor(max_workers=len(modules)) as executor:
+            list(executor.map(importlib.import_module, modules))
     except ImportError as e:
         pytest.fail(f"Failed to import core module: {e}")
 
@@ -36,14 +44,14 @@ def test_instantiate_core_classes():
 def test_multi_database_fetcher_integration(mock_read_sql, mock_db_manager_class):
     # Arrange
     mock_db_manager_instance = mock_db_manager_class.return_value
-    mock_engine = Mock()
+    mock_engine = MagicMock()
     mock_db_manager_instance.get_engine.return_value = mock_engine
     mock_db_manager_instance.cfg = {
         "database1": {"table": "test_table"}
     }
 
     # Mock the return value of pd.read_sql (which is called by fetch_data)
-    mock_read_sql.return_value = pd.DataFrame({"col1": [1], "col2": ["test"]})
+    mock_read_sql.return_value = iter([pd.DataFrame({"col1": [1], "col2": ["test"]})])
 
     # Instantiate the fetcher and inject the mocked DB manager
     from src.services.multi_database_fetcher import MultiDatabaseFetcher
@@ -62,13 +70,63 @@ def test_multi_database_fetcher_integration(mock_read_sql, mock_db_manager_class
     assert "params" in kwargs
 
 """ Test 4: can the CLI app be loaded without errors? """
-def test_cli_app_loads():
-    try:
-        from src.cli.main import app
-        from typer.main import Typer
-        assert isinstance(app, Typer)
-    except Exception as e:
-        pytest.fail(f"Failed to load or validate CLI app: {e}")
+def test_cli_app_loads(cli_app):
+    from typer.main import Typer
+    assert isinstance(cli_app, Typer)
+
+""" Test 5: are engines created once and reused across calls and DBManager instances? """
+@patch.dict("src.db.manager._ENGINES", clear=True)
+@patch("src.db.manager.create_engine")
+def test_get_engine_is_cached(mock_create_engine):
+    from src.db.manager import DBManager
+
+    engine = DBManager().get_engine("database1")
+
+    assert DBManager().get_engine("database1") is engine
+    mock_create_engine.assert_called_once()
+
+""" Test 6: does fetch_data read through a server-side cursor in bulk chunks? """
+@patch("src.query.fetcher.cx", None)
+@patch("src.query.fetcher.pd.read_sql")
+def test_fetch_uses_streaming(mock_read_sql):
+    from src.query.fetcher import fetch_data, DEFAULT_CHUNKSIZE
+
+    mock_engine = MagicMock()
+    mock_read_sql.return_value = iter([pd.DataFrame({"col1": [1]})])
+
+    fetch_data(mock_engine, "SELECT 1", {})
+
+    mock_engine.connect.return_value.execution_options.assert_called_once_with(stream_results=True, max_row_buffer=DEFAULT_CHUNKSIZE)
+    assert mock_read_sql.call_args.kwargs["chunksize"] == DEFAULT_CHUNKSIZE
+
+""" Test 7: does a DBManager built after a databases.yaml edit connect to the new server? """
+@patch.dict("src.db.manager._ENGINES", clear=True)
+@patch("src.db.manager.create_engine", side_effect=lambda conn_str, **kwargs: Mock(url=conn_str))
+def test_get_engine_follows_config_edits(mock_create_engine, tmp_path):
+    from src.db.manager import DBManager
+
+    config_path = tmp_path / "databases.yaml"
+    config_path.write_text("databases:\n  database1: {type: mysql, host: old-host, port: 3306, database: prod, table: t}\n")
+    old_engine = DBManager(config_path).get_engine("database1")
+
+    config_path.write_text("databases:\n  database1: {type: mysql, host: new-host, port: 3306, database: prod, table: t}\n")
+    os.utime(config_path, (0, os.path.getmtime(config_path) + 1))  # Distinct mtime even on coarse filesystem clocks
+    new_engine = DBManager(config_path).get_engine("database1")
+
+    assert "old-host" in old_engine.url
+    assert "new-host" in new_engine.url
+
+""" Test 8: is the cached config shared by DBManagers safe from changes through one of them? """
+def test_config_is_read_only():
+    from src.db.manager import DBManager
+
+    cfg = DBManager().cfg
+    database = next(iter(cfg))
+
+    with pytest.raises(TypeError):
+        cfg[database]["host"] = "other-host"
+    with pytest.raises(TypeError):
+        cfg["new_database"] = {}
 
 #TODO: add more integration tests for other critical paths after implementation
 
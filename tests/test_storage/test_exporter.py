@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from src.storage.exporter import export
+
+# Mixed dtypes, so a dropped or shifted cell shows up in the read-back frame
+_DF = pd.DataFrame({
+    "a": [1, 2, 3],
+    "b": ["x", "y", "z"],
+    "c": [1.5, 2.5, 3.5],
+    "source_database": ["db1", "db1", "db2"],
+})
+
+
+def test_export_xlsx_round_trip(tmp_path):
+    """
+    Test that every cell of an .xlsx export reads back unchanged, whichever Excel engine is installed
+    """
+    # Arrange
+    path = str(tmp_path / "out.xlsx")
+
+    # Act
+    export(_DF, path)
+
+    # Assert
+    pd.testing.assert_frame_equal(pd.read_excel(path), _DF)
+
+
+def test_export_csv_matches_pandas(tmp_path):
+    """
+    Test that the default CSV export is exactly pandas' output (short dates, strings quoted only when needed)
+    """
+    # Arrange
+    df = _DF.assign(day=pd.to_datetime(["2025-01-01", "2025-01-02", "2025-01-03"]))
+    path = tmp_path / "out.csv"
+
+    # Act
+    export(df, str(path))
+
+    # Assert
+    assert path.read_text() == df.to_csv(index=False)
+
+
+def test_export_arrow_csv_round_trip(tmp_path):
+    """
+    Test that the opt-in Arrow CSV writer keeps every value
+    """
+    # Arrange
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / "out.csv")
+
+    # Act
+    export(_DF, path, arrow_csv=True)
+
+    # Assert
+    pd.testing.assert_frame_equal(pd.read_csv(path), _DF)